@@ -3,34 +3,42 @@
 Simple model script for testing Vertex AI deployment
 """
 import argparse
+import json
 import logging
 import os
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def main():
-    """Main function to simulate model processing"""
-    logger.info("Starting model script execution.")
-    parser = argparse.ArgumentParser(description="Test model for Vertex AI")
-    parser.add_argument("--input_file", type=str, required=True, help="Input file path")
-    parser.add_argument("--out_folder", type=str, required=True, help="Output folder path")
+# Per-process model handle, populated once by load_model()
+_model = None
 
-    args = parser.parse_args()
+def load_model():
+    """Load (simulate) the model once and cache it for this process"""
+    global _model
+    if _model is None:
+        logger.info("Loading model...")
+        # Placeholder for real model initialization (weights, GPU context, ...)
+        _model = {"name": "simulated-model"}
+        logger.info("Model loaded.")
+    return _model
 
-    logger.info(f"Processing input file: {args.input_file}")
-    logger.info(f"Output folder: {args.out_folder}")
+def run(input_file: str, out_folder: str) -> bool:
+    """Simulate model processing for a single input file"""
+    load_model()
+    logger.info(f"Processing input file: {input_file}")
+    logger.info(f"Output folder: {out_folder}")
 
     # Simulate processing
     logger.info("Simulating model processing...")
 
     # Create a dummy output file in the specified output folder
     # Ensure the output folder exists (though api.py should create it)
-    os.makedirs(args.out_folder, exist_ok=True)
-    output_file_path = os.path.join(args.out_folder, "simulated_output.txt")
+    os.makedirs(out_folder, exist_ok=True)
+    output_file_path = os.path.join(out_folder, "simulated_output.txt")
     try:
         with open(output_file_path, "w") as f:
-            f.write(f"Simulated output based on input: {args.input_file}\n")
+            f.write(f"Simulated output based on input: {input_file}\n")
         logger.info(f"Simulated output written to {output_file_path}")
     except Exception as e:
         logger.error(f"Failed to write simulated output: {str(e)}")
@@ -40,5 +48,78 @@ def main():
     logger.info("Model processing simulation complete.") # Updated log message
     return True
 
+def run_from_stream(fileobj, out_folder: str) -> bool:
+    """
+    Simulate model processing for a streaming, read-once input.
+
+    The input is consumed sequentially from fileobj, so callers can hand
+    over e.g. a GCS blob reader and skip staging the file on disk.
+    """
+    load_model()
+    logger.info("Processing streamed input")
+
+    # Simulate processing by consuming the stream incrementally
+    logger.info("Simulating model processing...")
+    total_bytes = 0
+    while True:
+        chunk = fileobj.read(1024 * 1024)
+        if not chunk:
+            break
+        total_bytes += len(chunk)
+
+    os.makedirs(out_folder, exist_ok=True)
+    output_file_path = os.path.join(out_folder, "simulated_output.txt")
+    try:
+        with open(output_file_path, "w") as f:
+            f.write(f"Simulated output based on streamed input ({total_bytes} bytes)\n")
+        logger.info(f"Simulated output written to {output_file_path}")
+    except Exception as e:
+        logger.error(f"Failed to write simulated output: {str(e)}")
+        return False # Indicate failure
+
+    logger.info("Model processing simulation complete.")
+    return True
+
+def run_manifest(entries, out_folder: str) -> list:
+    """
+    Process a list of [input_file, out_subdir] pairs in this process.
+
+    Returns one success flag per entry, in order, so the caller can report
+    each input's outcome instead of discarding the batch on one failure.
+    """
+    statuses = []
+    for input_file, out_subdir in entries:
+        target = os.path.join(out_folder, out_subdir) if out_subdir else out_folder
+        statuses.append(run(input_file, target))
+    return statuses
+
+def main():
+    """Main function to simulate model processing"""
+    logger.info("Starting model script execution.")
+    parser = argparse.ArgumentParser(description="Test model for Vertex AI")
+    parser.add_argument("--input_file", type=str, help="Input file path")
+    parser.add_argument("--out_folder", type=str, required=True, help="Output folder path")
+    parser.add_argument(
+        "--input_manifest",
+        type=str,
+        help="Path to a JSON manifest listing [input_file, out_subdir] pairs to process in one run",
+    )
+
+    args = parser.parse_args()
+
+    # Build the list of (input_file, out_subdir) pairs to process.
+    # A manifest lets the caller amortize interpreter/import startup cost
+    # across a whole batch instead of paying it once per instance.
+    if args.input_manifest:
+        with open(args.input_manifest) as f:
+            entries = json.load(f)
+        logger.info(f"Loaded manifest with {len(entries)} entries from {args.input_manifest}")
+    elif args.input_file:
+        entries = [[args.input_file, ""]]
+    else:
+        parser.error("Either --input_file or --input_manifest must be provided")
+
+    return all(run_manifest(entries, args.out_folder))
+
 if __name__ == "__main__":
     main()